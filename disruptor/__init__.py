@@ -0,0 +1,2 @@
+from .disruptor import (Consumer, ConsumerStats, ConsumerThread, Disruptor, DisruptorStats, RingBuffer,
+                        RingBufferLagStats, RingSynchronizer)
@@ -1,20 +1,90 @@
+import array
 import asyncio
 import time
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _mget_np(buffer, s_index, count):
+    """
+    Get count elements from a numpy ring buffer starting at an already wrapped index; a view if they don't wrap
+    """
+    n_head = min(buffer.size - s_index, count)
+    if n_head == count:
+        return buffer[s_index:s_index+count]
+    elements = np.empty(count, buffer.dtype)
+    elements[:n_head] = buffer[s_index:]
+    elements[n_head:] = buffer[:count - n_head]
+    return elements
+
+
+def _mset_np(buffer, s_index, elements):
+    """
+    Copy a numpy array into a numpy ring buffer starting at an already wrapped index
+    """
+    n_head = min(buffer.size - s_index, elements.size)
+    buffer[s_index:s_index+n_head] = elements[:n_head]
+    if n_head < elements.size:
+        buffer[:elements.size - n_head] = elements[n_head:]
+
+
+if hasattr(asyncio, 'timeout'):
+    async def _wait_event(event, timeout_sec):
+        """
+        Wait for an event to be set or for timeout_sec to pass, whichever is first
+        """
+        try:
+            async with asyncio.timeout(timeout_sec):
+                await event.wait()
+        except asyncio.TimeoutError:
+            pass
+else:
+    async def _wait_event(event, timeout_sec):
+        """
+        Wait for an event to be set or for timeout_sec to pass, whichever is first; wait_for fallback for Python < 3.11
+        """
+        try:
+            await asyncio.wait_for(event.wait(), timeout_sec)
+        except asyncio.TimeoutError:
+            pass
+
 
 class RingBuffer:
     """
     Fast, list backed, preallocated Ring Buffer with static size.  Not thread safe and has no safety checking.
+
+    Capacity is always rounded up to the next power of two so that indexes can be wrapped with a bitwise AND
+    instead of a modulo.
+
+    When constructed with a dtype the buffer is backed by a numpy array instead of a list, which avoids per-element
+    object overhead for fixed-width numeric payloads.
     """
 
-    def __init__(self, size):
+    __slots__ = ('buffer', 'dtype', 'size', 'mask')
+
+    def __init__(self, size, dtype=None):
         """
         Construct a RingBuffer
-        :param size: size of buffer
+        :param size: requested size of buffer - must be >= 1, rounded up to the next power of two
         :type size: int
-        """
-        self.buffer = [None] * size
+        :param dtype: optional numpy dtype of elements; requires numpy
+        :type dtype: numpy.dtype
+        """
+        if size < 1:
+            raise ValueError('RingBuffer size must be at least 1, got {}'.format(size))
+        size = 1 << (size - 1).bit_length()
+        if dtype is not None:
+            if np is None:
+                raise ImportError('numpy is required for a RingBuffer with a dtype')
+            self.buffer = np.empty(size, dtype)
+        else:
+            self.buffer = [None] * size
+        self.dtype = dtype
         self.size = size
+        self.mask = size - 1
 
     def set(self, index, element):
         """
@@ -27,7 +97,7 @@ class RingBuffer:
         :returns: self
         :rtype: RingBuffer
         """
-        self.buffer[index % self.size] = element
+        self.buffer[index & self.mask] = element
         return self
 
     def get(self, index):
@@ -38,7 +108,7 @@ class RingBuffer:
         :returns: element at index
         :rtype: *
         """
-        return self.buffer[index % self.size]
+        return self.buffer[index & self.mask]
 
     def mget(self, start_index, count):
         """
@@ -48,34 +118,50 @@ class RingBuffer:
         :type start_index: int
         :param count: number of elements to get - must be >= 0
         :type count: int
-        :returns: list of elements
+        :returns: list of elements, or a numpy array if the buffer has a dtype.  A numpy array that does not wrap
+            around the end of the buffer is a view into the buffer, not a copy
         :rtype: list
         """
-        s_index = start_index % self.size
+        s_index = start_index & self.mask
+        if self.dtype is not None:
+            return _mget_np(self.buffer, s_index, count)
         if s_index + count > self.size:
-            return self.buffer[s_index:] + self.buffer[0:(s_index + count) - self.size]
+            # extend the head slice in place rather than concatenating into a third list
+            elements = self.buffer[s_index:]
+            elements += self.buffer[0:(s_index + count) - self.size]
+            return elements
         else:
             return self.buffer[s_index:s_index+count]
 
-    def mset(self, start_index, elements):
+    def mset(self, start_index, elements, src_start=0, src_count=None):
         """
-        Set multiple elements in buffer
+        Set multiple elements in buffer, optionally only a range of the supplied elements
 
         :param start_index: a positive start index - can wrap around size of buffer
         :type start_index: int
         :param elements: collection of elements
         :type elements: list
+        :param src_start: index of first element in elements to set
+        :type src_start: int
+        :param src_count: number of elements to set - defaults to all elements from src_start
+        :type src_count: int
         :returns: self
         :rtype: RingBuffer
         """
-        s_index = start_index % self.size
-        if s_index + len(elements) > self.size:
-            self.buffer[s_index:self.size] = elements[0:self.size - s_index]
-            self.buffer[0:len(elements) - (self.size - s_index)
-                        ] = elements[self.size-s_index:len(elements)]
+        if src_count is None:
+            src_count = len(elements) - src_start
+        s_index = start_index & self.mask
+        if self.dtype is not None:
+            if src_start > 0 or src_count < len(elements):
+                elements = elements[src_start:src_start+src_count]
+            _mset_np(self.buffer, s_index, np.asarray(elements, dtype=self.buffer.dtype))
+        elif s_index + src_count > self.size:
+            self.buffer[s_index:self.size] = elements[src_start:src_start + self.size - s_index]
+            self.buffer[0:src_count - (self.size - s_index)
+                        ] = elements[src_start + self.size - s_index:src_start + src_count]
         else:
             self.buffer[s_index:s_index +
-                        len(elements)] = elements[0:len(elements)]
+                        src_count] = elements[src_start:src_start + src_count]
 
 
 class ConsumerStats:
@@ -83,6 +169,8 @@ class ConsumerStats:
     Statistics object for keeping track of consumer stats
     """
 
+    __slots__ = ('consumer_t', 'blocked_ns', 'consumed', 'consumption_ns')
+
     def __init__(self, consumer_t):
         """
         Construct a consuemr for a consumer thread
@@ -90,28 +178,28 @@ class ConsumerStats:
         :type consumer_t: ConsumerThread
         """
         self.consumer_t = consumer_t
-        self.blocked_sec = 0
+        self.blocked_ns = 0
         self.consumed = 0
-        self.consumption_sec = 0
+        self.consumption_ns = 0
 
-    def report_blocked(self, sec):
+    def report_blocked(self, ns):
         """
-        Report an instance of a consumer being blocked on production for supplied seconds
-        :param sec: time consumer was blocked in seconds
-        :type sec: float
+        Report an instance of a consumer being blocked on production for supplied nanoseconds
+        :param ns: time consumer was blocked in nanoseconds
+        :type ns: int
         """
-        self.blocked_sec = self.blocked_sec + sec
+        self.blocked_ns = self.blocked_ns + ns
 
-    def report_consumed(self, n_elements, sec):
+    def report_consumed(self, n_elements, ns):
         """
-        Report a consumer consuming a number of elements over some time period in seconds
+        Report a consumer consuming a number of elements over some time period in nanoseconds
         :param n_elements: number of elements consumed
         :type n_elements: int
-        :param sec: time taken to consume elements
-        :type sec: float
+        :param ns: time taken to consume elements in nanoseconds
+        :type ns: int
         """
         self.consumed = self.consumed + n_elements
-        self.consumption_sec = self.consumption_sec + sec
+        self.consumption_ns = self.consumption_ns + ns
 
     @property
     def cps(self):
@@ -120,17 +208,17 @@ class ConsumerStats:
         :returns: elements consumed per second
         :rtype: float
         """
-        if self.consumption_sec > 0:
-            return self.consumed / self.consumption_sec
+        if self.consumption_ns > 0:
+            return self.consumed * 1e9 / self.consumption_ns
         else:
             return 0
 
     def __str__(self):
         return '\n'.join([
             'Consumer: {}'.format(self.consumer_t.consumer),
-            ' blocked_sec:{}'.format(self.blocked_sec),
+            ' blocked_ns:{}'.format(self.blocked_ns),
             ' consumed:{}'.format(self.consumed),
-            ' consume_sec:{}'.format(self.consumption_sec),
+            ' consume_ns:{}'.format(self.consumption_ns),
             ' cps:{}'.format(self.cps)
         ])
 
@@ -141,10 +229,12 @@ class RingBufferLagStats:
     used to keep track of how far the slowest consumer is behind producers
     """
 
+    __slots__ = ('cur_lag', 'max_lag', 'sum_lag', 'n_samples')
+
     def __init__(self):
         self.cur_lag = 0
         self.max_lag = 0
-        self.avg_lag = 0
+        self.sum_lag = 0
         self.n_samples = 0
 
     def sample(self, lag):
@@ -156,10 +246,21 @@ class RingBufferLagStats:
         self.cur_lag = lag
         if lag > self.max_lag:
             self.max_lag = lag
-        self.avg_lag = ((self.avg_lag * self.n_samples) + lag) / \
-            (self.n_samples + 1)
+        self.sum_lag = self.sum_lag + lag
         self.n_samples = self.n_samples + 1
 
+    @property
+    def avg_lag(self):
+        """
+        Return average of all lag samples
+        :returns: average lag
+        :rtype: float
+        """
+        if self.n_samples > 0:
+            return self.sum_lag / self.n_samples
+        else:
+            return 0
+
     def __str__(self):
         return 'cur_lag: {}, avg_lag: {}, max_lag: {}'.format(self.cur_lag, self.avg_lag, self.max_lag)
 
@@ -170,26 +271,27 @@ class DisruptorStats:
     """
 
     def __init__(self, time_fn):
+        """
+        Construct DisruptorStats
+        :param time_fn: zero argument time provider function returning integer nanoseconds
+        :type time_fn: Function
+        """
         self.time_fn = time_fn
         self.consumer_stats = {}
-        self.p_blocked_sec = 0
+        self.p_blocked_ns = 0
         self.produced = 0
         self.ring_lag_stats = RingBufferLagStats()
         self.start_time = time_fn()
         self.end_time = None
 
-    def report_c_consumed(self, consumer_t, n_elements, sec):
+    def register_consumer(self, consumer_t):
         """
-        Report a consumer thread consuming some number of elements
+        Register the stats of a consumer thread so they are included in this container; consumer threads report
+        consumption and blocking to their own ConsumerStats directly
         :param consumer_t: a ConsumerThread
         :type consumer_t: ConsumerThread
-        :param n_elements: number of elements consumed
-        :type n_elements: int
-        :param sec: time taken to consume elements
-        :type sec: float
         """
-        self.consumer_stats.setdefault(consumer_t.thread.name, ConsumerStats(
-            consumer_t)).report_consumed(n_elements, sec)
+        self.consumer_stats[consumer_t.name] = consumer_t.stats
 
     def report_p_produced(self, n_elements):
         """
@@ -198,24 +300,13 @@ class DisruptorStats:
         """
         self.produced = self.produced + n_elements
 
-    def report_c_blocked(self, consumer_t, sec):
-        """
-        Report an instance of a consumer being blocked on production for supplied seconds
-        :param consumer_t: a ConsumerThread
-        :type consumer_t: ConsumerThread
-        :param sec: time consumer was blocked in seconds
-        :type sec: float
-        """
-        self.consumer_stats.setdefault(consumer_t.thread.name, ConsumerStats(
-            consumer_t)).report_blocked(sec)
-
-    def report_p_blocked(self, sec):
+    def report_p_blocked(self, ns):
         """
-        Report a publisher being blocked on a "full" ring for supplied number of seconds
-        :param sec: time producer was blocked in seconds
-        :type sec: float
+        Report a publisher being blocked on a "full" ring for supplied number of nanoseconds
+        :param ns: time producer was blocked in nanoseconds
+        :type ns: int
         """
-        self.p_blocked_sec = self.p_blocked_sec + sec
+        self.p_blocked_ns = self.p_blocked_ns + ns
 
     def report_ring_lag(self, lag_size):
         """
@@ -229,11 +320,11 @@ class DisruptorStats:
         self.end_time = self.time_fn()
 
     @property
-    def production_sec(self):
+    def production_ns(self):
         """
-        Return number of seconds disruptor was operational
-        :returns: number of seconds disruptor was operational
-        :rtype: float
+        Return number of nanoseconds disruptor was operational
+        :returns: number of nanoseconds disruptor was operational
+        :rtype: int
         """
         if self.end_time is not None:
             return self.end_time - self.start_time
@@ -247,8 +338,9 @@ class DisruptorStats:
         :returns: elements produced per second
         :rtype: float
         """
-        if self.production_sec > 0:
-            return self.produced / self.production_sec
+        production_ns = self.production_ns
+        if production_ns > 0:
+            return self.produced * 1e9 / production_ns
         else:
             return 0
 
@@ -256,9 +348,9 @@ class DisruptorStats:
         return '\n'.join([
             'Ring: {}'.format(self.ring_lag_stats),
             'Producers:',
-            ' blocked_sec:{}'.format(self.p_blocked_sec),
+            ' blocked_ns:{}'.format(self.p_blocked_ns),
             ' produced:{}'.format(self.produced),
-            ' produce_sec:{}'.format(self.production_sec),
+            ' produce_ns:{}'.format(self.production_ns),
             ' pps:{}'.format(self.pps),
         ] + [str(value) for (key, value) in self.consumer_stats.items()])
 
@@ -266,6 +358,11 @@ class DisruptorStats:
 class RingSynchronizer:
     """
     Disruptor synchronization uitlity
+
+    Production and consumption are signalled with edge-triggered events: a notification sets the current event and
+    replaces it with a fresh one.  Waiters capture the current event as soon as they start waiting, so a notification
+    that lands before the waiter is scheduled is never lost.  Notifications are dropped while nobody is waiting, so a
+    busy producer or consumer does not churn through events.
     """
 
     def __init__(self):
@@ -273,8 +370,10 @@ class RingSynchronizer:
         Construct RingSynchronizer
         """
         self.lock = asyncio.Lock()
-        self.produced_condition = asyncio.Condition(self.lock)
-        self.consumed_condition = asyncio.Condition(self.lock)
+        self.produced_event = asyncio.Event()
+        self.consumed_event = asyncio.Event()
+        self.production_waiters = 0
+        self.consumption_waiters = 0
 
     async def __aenter__(self):
         await self.lock.acquire()
@@ -284,37 +383,80 @@ class RingSynchronizer:
 
     async def await_production(self, timeout_sec=5):
         """
-        Block calling thread for supplied amount of time or until a production condition occurs
+        Block calling thread for supplied amount of time or until a production condition occurs;
+        must be called without holding the lock
 
         :param timeout_sec: timeout seconds
         :type timeout_sec: float
         """
-        async with self.produced_condition:
-            await asyncio.wait_for(self.produced_condition.wait(), timeout_sec)
+        self.production_waiters += 1
+        try:
+            await _wait_event(self.produced_event, timeout_sec)
+        finally:
+            self.production_waiters -= 1
 
     async def await_consumption(self, timeout_sec=5):
         """
-        Block calling thread for supplied amount of time or until a consumption condition occurs
+        Block calling thread for supplied amount of time or until a consumption condition occurs;
+        must be called without holding the lock
 
         :param timeout_sec: timeout seconds
         :type timeout_sec: float
         """
-        async with self.consumed_condition:
-            await asyncio.wait_for(self.consumed_condition.wait(), timeout_sec)
+        self.consumption_waiters += 1
+        try:
+            await _wait_event(self.consumed_event, timeout_sec)
+        finally:
+            self.consumption_waiters -= 1
 
     async def notify_production(self):
         """
         Notify and unblock all threads waiting on a production condition
         """
-        async with self.produced_condition:
-            self.produced_condition.notify_all()
+        self.notify_production_locked()
+
+    def notify_production_locked(self):
+        """
+        Notify and unblock all threads waiting on a production condition; does not need to await the lock
+        """
+        if self.production_waiters > 0:
+            self.produced_event.set()
+            self.produced_event = asyncio.Event()
 
     async def notify_consumption(self):
         """
         Notify and unblock all threads waiting on a consumption condition
         """
-        async with self.consumed_condition:
-            self.consumed_condition.notify_all()
+        self.notify_consumption_locked()
+
+    def notify_consumption_locked(self):
+        """
+        Notify and unblock all threads waiting on a consumption condition; does not need to await the lock
+        """
+        if self.consumption_waiters > 0:
+            self.consumed_event.set()
+            self.consumed_event = asyncio.Event()
+
+
+class Consumer:
+    """
+    Disruptor consumer base class; subclasses must implement consume
+    """
+
+    async def consume(self, elements):
+        """
+        Consume a batch of elements
+        :param elements: elements to consume - a numpy array if the disruptor has a dtype.  A numpy batch is
+            usually a view into the ring and is overwritten once consume returns; copy it to keep it
+        :type elements: list
+        """
+        raise NotImplementedError()
+
+    def close(self):
+        """
+        Invoked once after the disruptor is closed and all remaining elements have been consumed
+        """
+        pass
 
 
 class ConsumerThread:
@@ -322,58 +464,85 @@ class ConsumerThread:
     A disruptor consumption thread wrapper
     """
 
+    __slots__ = ('disruptor', 'consumer', 'name', 'idx', 'stats', 'task')
+
     def __init__(self, disruptor, consumer):
         self.disruptor = disruptor
         self.consumer = consumer
-        self.seqnum = disruptor.producer_seqnum
-        self.task = asyncio.create_task(self.run())
+        self.name = '{}-consumer-{}'.format(disruptor.name, len(disruptor.consumers))
+        # keep a direct reference to this consumer's stats so reporting skips the by-name lookup
+        self.stats = ConsumerStats(self)
+        # this consumer's seqnum lives in the disruptor's consumer_seqnums array at index idx; the slot is only
+        # allocated once the task exists, so a failed start (e.g. no running loop) leaves no orphan slot behind
+        # that would hold back the producer forever
+        self.idx = len(disruptor.consumer_seqnums)
+        self.task = asyncio.get_running_loop().create_task(self.run(), name=self.name)
+        disruptor.consumer_seqnums.append(disruptor.producer_seqnum)
+
+    @property
+    def seqnum(self):
+        """
+        Return sequence number of the next element this consumer will consume
+        :returns: sequence number
+        :rtype: int
+        """
+        return self.disruptor.consumer_seqnums[self.idx]
 
     async def run(self):
         """
         Consume while there's something to consume!
         """
-        available_count = 0
-        to_consume = None
+        seqnums = self.disruptor.consumer_seqnums
         while self.disruptor.running:
 
             # report ring lag once in a while
-            await self.disruptor._unsafe_report_lag()
-
-            while available_count == 0 and self.disruptor.running:
-                # atomically check+fetch available data and go to sleep if none
-                async with self.disruptor.sync:
-                    available_count = self.disruptor.producer_seqnum - self.seqnum
-                    if available_count > 0:
-                        to_consume = self.disruptor.ring_buffer.mget(
-                            self.seqnum, available_count)
-                    else:
-                        s = self.disruptor.time_fn()
-                        await self.disruptor.sync.await_production()
-                        self.disruptor.stats.report_c_blocked(
-                            self, self.disruptor.time_fn()-s)
-
-            # when data is available, consume it *outside* of lock!
-            await self._consume_safe(to_consume)
-
-            # re-lock after consumption to update state
+            self.disruptor._unsafe_report_lag()
+
+            # check available data without locking - producer_seqnum is only ever advanced, and the producer
+            # never overwrites slots this consumer has not consumed yet
+            seqnum = seqnums[self.idx]
+            available_count = self.disruptor.producer_seqnum - seqnum
+            if available_count == 0:
+                # no await between the check and waiting, so no production can be missed
+                s = self.disruptor.time_fn()
+                await self.disruptor.sync.await_production()
+                self.stats.report_blocked(self.disruptor.time_fn()-s)
+                continue
+
+            await self._consume_safe(self.disruptor.ring_buffer.mget(
+                seqnum, available_count), available_count)
+
+            # lock after consumption to update state
             async with self.disruptor.sync:
-                self.seqnum = self.seqnum + available_count
-                await self.disruptor.sync.notify_consumption()
-                available_count = 0
-                to_consume = None
-
-        # after disruptor stops, consume the rest of available data
-        to_consume = None
-        async with self.disruptor.sync:
-            available_count = self.disruptor.producer_seqnum - self.seqnum
-            if available_count > 0:
-                to_consume = self.disruptor.ring_buffer.mget(
-                    self.seqnum, available_count)
-        await self._consume_safe(to_consume)
+                self._advance(seqnum, available_count)
+
+        # after disruptor stops, consume the rest of available data - no locking is needed for the same reason
+        # as above: slots this consumer has not consumed yet are never overwritten
+        seqnum = seqnums[self.idx]
+        available_count = self.disruptor.producer_seqnum - seqnum
+        await self._consume_safe(self.disruptor.ring_buffer.mget(
+            seqnum, available_count), available_count)
+        if available_count > 0:
+            self._advance(seqnum, available_count)
         self.consumer.close()
 
-    async def _consume_safe(self, elements):
-        if elements is not None and len(elements) > 0:
+    def _advance(self, seqnum, count):
+        """
+        Move this consumer past count consumed elements and notify producers; must not await
+        :param seqnum: sequence number the consumed elements started at
+        :type seqnum: int
+        :param count: number of elements consumed
+        :type count: int
+        """
+        seqnums = self.disruptor.consumer_seqnums
+        seqnums[self.idx] = seqnum + count
+        # only the slowest consumer(s) can move the cached minimum
+        if seqnum == self.disruptor.min_consumer_seqnum:
+            self.disruptor.min_consumer_seqnum = min(seqnums)
+        self.disruptor.sync.notify_consumption_locked()
+
+    async def _consume_safe(self, elements, count):
+        if count > 0:
             s = self.disruptor.time_fn()
             try:
                 await self.consumer.consume(elements)
@@ -381,8 +550,7 @@ class ConsumerThread:
                 if self.disruptor.consumer_error_handler is not None:
                     self.disruptor.consumer_error_handler(
                         self.consumer, elements, e)
-            self.disruptor.stats.report_c_consumed(
-                self, len(elements), self.disruptor.time_fn() - s)
+            self.stats.report_consumed(count, self.disruptor.time_fn() - s)
 
 
 class Disruptor:
@@ -407,31 +575,41 @@ class Disruptor:
     supporting efficient parallel consumption of data.
     """
 
-    def __init__(self, size=1024, name='Disruptor', consumer_error_handler=None, time_fn=time.time):
+    def __init__(self, size=1024, name='Disruptor', consumer_error_handler=None, time_fn=time.monotonic_ns, dtype=None):
         """
         Initialize a disruptor of supplied size
-        :param size: size of disruptor ring buffer
+        :param size: size of disruptor ring buffer - must be >= 1, rounded up to the next power of two
         :type size: int
         :param name: disruptor name (used in naming consumer threads)
         :type name: str
-        :param consumer_error_handler: optional function invoked if a consumer fails to consume data.  Must accept a consumer instance, input to consumer, and error
+        :param consumer_error_handler: optional function invoked if a consumer fails to consume data.  Must accept a consumer instance, input to consumer, and error.
+            With a dtype the input is usually a view into the ring, only valid until the handler returns
         :type consumer_error_handler: Function
-        :param time_fn: zero argument time provider function - defaults to time.time(); used strictly for statistics
+        :param time_fn: zero argument time provider function returning integer nanoseconds - defaults to
+            time.monotonic_ns(); used strictly for statistics
         :type time_fn: Function
+        :param dtype: optional numpy dtype of elements; backs the ring buffer with a numpy array
+        :type dtype: numpy.dtype
         """
         self.name = name
         self.time_fn = time_fn
         self.consumer_error_handler = consumer_error_handler
         self.stats = DisruptorStats(time_fn)
-        self.ring_buffer = RingBuffer(size)
+        self.ring_buffer = RingBuffer(size, dtype)
         self.sync = RingSynchronizer()
         self.producer_seqnum = 0
+        # seqnums of all consumers, indexed by ConsumerThread.idx, and their cached minimum; both maintained by
+        # consumers as they advance
+        self.consumer_seqnums = array.array('q')
+        self.min_consumer_seqnum = 0
         self.consumers = []
         self.running = True
+        self._lag_sample_counter = 0
 
     async def produce(self, elements):
         """
-        Produce multiple elements, blocking if the disruptor is full
+        Produce multiple elements, blocking if the disruptor is full.  Elements produced while no consumers are
+        registered are discarded
 
         :param elements: list of elements to produce
         :type elements: list
@@ -440,7 +618,14 @@ class Disruptor:
             raise Exception('Disruptor is stopped')
 
         # report ring lag once in a while
-        await self._unsafe_report_lag()
+        self._unsafe_report_lag()
+
+        if not self.consumer_seqnums:
+            # without consumers nothing would ever consume these elements or free their slots, and consumers
+            # registered later start at the current producer seqnum - skip past them instead of blocking forever
+            self.producer_seqnum += len(elements)
+            self.stats.report_p_produced(len(elements))
+            return
 
         produced = 0
 
@@ -473,24 +658,29 @@ class Disruptor:
                 # 
                 # * (ring_size - p_idx) + min(C1_idx, C2_idx)
                 #   (30        - 18   ) + 8                  = 20
-                # * ring_size - p_seq + min(C1_seq, C2_seq)
-                #   30        - 88    + 78                   = 20
+                # * ring_size - (p_seq - min(C1_seq, C2_seq))
+                #   30        - (88    - 78                ) = 20
                 #
-                # This code uses the second approach because it doesn't require
-                # computing an index in the ring buffer.
-                can_produce = self.ring_buffer.size - self.producer_seqnum + \
-                    min(map(lambda c: c.seqnum, self.consumers))
-                if can_produce <= 0:
-                    s = self.time_fn()
-                    await self.sync.await_consumption()
-                    self.stats.report_p_blocked(self.time_fn()-s)
-                else:
-                    to_produce_cnt = min(can_produce, len(elements) - produced)
+                # This code uses the second approach, the classic Disruptor free slot
+                # formula: it doesn't require computing an index in the ring buffer and
+                # the minimum consumer seqnum is already cached.
+                can_produce = self.ring_buffer.size - \
+                    (self.producer_seqnum - self.min_consumer_seqnum)
+                to_produce_cnt = min(can_produce, len(elements) - produced)
+                if to_produce_cnt > 0:
                     self.ring_buffer.mset(
-                        self.producer_seqnum, elements[produced:produced+to_produce_cnt:])
+                        self.producer_seqnum, elements, produced, to_produce_cnt)
                     produced += to_produce_cnt
                     self.producer_seqnum += to_produce_cnt
-                    await self.sync.notify_production()
+                    # the only notification per write: either the batch is done, or the producer is about
+                    # to block and consumers must not starve while it waits
+                    self.sync.notify_production_locked()
+            if produced < len(elements):
+                # ring is full - wait for the slowest consumer; no await between releasing the lock
+                # and waiting, so no consumption can be missed
+                s = self.time_fn()
+                await self.sync.await_consumption()
+                self.stats.report_p_blocked(self.time_fn()-s)
 
         self.stats.report_p_produced(produced)
 
@@ -502,5 +692,34 @@ class Disruptor:
             if self.running:
                 self.running = False
                 # wake up any threads waiting on production
-                await self.sync.notify_production()
-        for consumer
+                self.sync.notify_production_locked()
+        for consumer_t in self.consumers:
+            await consumer_t.task
+        self.stats.close()
+
+    def register_consumer(self, consumer):
+        """
+        Register a consumer and start its consumption task; must be called from within a running event loop.
+        The consumer only receives elements produced after registration.
+
+        :param consumer: consumer to register
+        :type consumer: Consumer
+        :returns: consumer thread wrapping the consumer
+        :rtype: ConsumerThread
+        """
+        if not self.running:
+            raise Exception('Disruptor is stopped')
+        consumer_t = ConsumerThread(self, consumer)
+        self.consumers.append(consumer_t)
+        self.stats.register_consumer(consumer_t)
+        self.min_consumer_seqnum = min(self.consumer_seqnums)
+        return consumer_t
+
+    def _unsafe_report_lag(self):
+        """
+        Report how far the slowest consumer is behind producers once every 256 calls; reads sequence numbers
+        without locking
+        """
+        self._lag_sample_counter += 1
+        if self._lag_sample_counter & 0xFF == 0 and len(self.consumers) > 0:
+            self.stats.report_ring_lag(self.producer_seqnum - self.min_consumer_seqnum)
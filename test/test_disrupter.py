@@ -1,6 +1,6 @@
 import pytest
 import asyncio
-from disruptor import Disruptor, Consumer
+from disruptor import Disruptor, Consumer, RingBuffer, RingBufferLagStats, RingSynchronizer
 
 
 class TestConsumer(Consumer):
@@ -26,18 +26,254 @@ async def test_disruptor():
 
 @pytest.mark.asyncio
 async def test_disruptor_full():
-    disruptor = Disruptor(size=3)
+    disruptor = Disruptor(size=4)
     consumer = TestConsumer()
     disruptor.register_consumer(consumer)
 
-    await disruptor.produce([1, 2, 3])
+    await disruptor.produce([1, 2, 3, 4])
+    assert disruptor.producer_seqnum - disruptor.min_consumer_seqnum == disruptor.ring_buffer.size
     await asyncio.sleep(1)  # give some time for consumers to process
 
-    assert consumer.consumed_elements == [1, 2, 3]
+    assert consumer.consumed_elements == [1, 2, 3, 4]
 
-    await disruptor.produce([4, 5, 6])
+    await disruptor.produce([5, 6, 7, 8])
     await asyncio.sleep(1)  # give some time for consumers to process
 
-    assert consumer.consumed_elements == [1, 2, 3, 4, 5, 6]
+    assert consumer.consumed_elements == [1, 2, 3, 4, 5, 6, 7, 8]
+
+    await disruptor.close()
+
+
+@pytest.mark.asyncio
+async def test_disruptor_without_consumers_does_not_block():
+    disruptor = Disruptor(size=4)
+    await asyncio.wait_for(disruptor.produce(list(range(10))), 1)
+    assert disruptor.producer_seqnum == 10
+
+    consumer = TestConsumer()
+    disruptor.register_consumer(consumer)
+    await disruptor.produce([10, 11])
+    await disruptor.close()
+
+    assert consumer.consumed_elements == [10, 11]
+
+
+def test_ring_buffer_rounds_up_to_power_of_two():
+    ring = RingBuffer(5)
+    assert ring.size == 8
+    assert ring.mask == 7
+    assert RingBuffer(1).size == 1
+
+    for size in (0, -6):
+        with pytest.raises(ValueError):
+            RingBuffer(size)
+
+    ring.mset(6, [1, 2, 3, 4])
+    assert ring.mget(6, 4) == [1, 2, 3, 4]
+    assert ring.get(9) == 4
+
+
+def test_ring_buffer_mset_source_range():
+    ring = RingBuffer(8)
+
+    ring.mset(0, [0, 1, 2, 3, 4, 5, 6, 7])
+    ring.mset(14, [0, 5, 6, 7, 0], 1, 3)
+    assert ring.mget(14, 4) == [5, 6, 7, 1]
+
+    ring.mset(3, [9, 8, 7], 1)
+    assert ring.mget(3, 3) == [8, 7, 5]
+
+
+def test_ring_buffer_dtype():
+    np = pytest.importorskip('numpy')
+    ring = RingBuffer(4, dtype=np.float64)
+
+    ring.mset(2, [1, 2, 3])
+    assert ring.mget(2, 3).tolist() == [1.0, 2.0, 3.0]
+    assert np.shares_memory(ring.mget(0, 1), ring.buffer)
+    assert ring.get(4) == 3.0
+
+
+@pytest.mark.asyncio
+async def test_disruptor_slowest_consumer_bounds_producer():
+    disruptor = Disruptor(size=4)
+    fast = TestConsumer()
+    slow = TestConsumer()
+    disruptor.register_consumer(fast)
+    disruptor.register_consumer(slow)
+
+    await disruptor.produce(list(range(4)))
+    assert disruptor.min_consumer_seqnum == 0
+    await asyncio.sleep(0)  # let both consumers run once
+    assert disruptor.min_consumer_seqnum == 4
+
+    await disruptor.produce(list(range(4, 20)))
+    await disruptor.close()
+
+    assert fast.consumed_elements == list(range(20))
+    assert slow.consumed_elements == list(range(20))
+    assert disruptor.min_consumer_seqnum == 20
+
+
+class GatedConsumer(TestConsumer):
+    def __init__(self):
+        super().__init__()
+        self.gate = asyncio.Event()
+
+    async def consume(self, elements):
+        await self.gate.wait()
+        await super().consume(elements)
+
+
+@pytest.mark.asyncio
+async def test_disruptor_lagging_consumer_holds_back_producer():
+    disruptor = Disruptor(size=4)
+    fast = TestConsumer()
+    slow = GatedConsumer()
+    disruptor.register_consumer(fast)
+    disruptor.register_consumer(slow)
+
+    await disruptor.produce(list(range(4)))
+    for _ in range(3):
+        await asyncio.sleep(0)
+    # the fast consumer advanced, but the cached minimum stays with the lagging one
+    assert fast.consumed_elements == list(range(4))
+    assert slow.consumed_elements == []
+    assert disruptor.min_consumer_seqnum == 0
+
+    producer = asyncio.create_task(disruptor.produce(list(range(4, 10))))
+    await asyncio.sleep(0.1)
+    assert not producer.done()
+    assert disruptor.producer_seqnum == 4
+
+    slow.gate.set()
+    await asyncio.wait_for(producer, 1)
+    await disruptor.close()
+
+    assert fast.consumed_elements == list(range(10))
+    assert slow.consumed_elements == list(range(10))
+    assert disruptor.min_consumer_seqnum == 10
+
+
+@pytest.mark.asyncio
+async def test_ring_synchronizer_wait_times_out_quietly():
+    sync = RingSynchronizer()
+    await sync.await_production(timeout_sec=0.01)
+
+    waiter = asyncio.create_task(sync.await_consumption())
+    await asyncio.sleep(0)
+    sync.notify_consumption_locked()
+    await asyncio.wait_for(waiter, 1)
+
+
+def test_ring_buffer_lag_stats():
+    stats = RingBufferLagStats()
+    assert stats.avg_lag == 0
+
+    for lag in (3, 9, 0):
+        stats.sample(lag)
+    assert (stats.cur_lag, stats.max_lag, stats.avg_lag) == (0, 9, 4)
+
+
+class FailingConsumer(Consumer):
+    async def consume(self, elements):
+        for element in elements:
+            raise ValueError(element)
+
+
+@pytest.mark.asyncio
+async def test_disruptor_error_handler_receives_whole_batch():
+    errors = []
+    disruptor = Disruptor(size=4, consumer_error_handler=lambda c, elements, e: errors.append(list(elements)))
+    disruptor.register_consumer(FailingConsumer())
+
+    await disruptor.produce([1, 2, 3])
+    await disruptor.close()
+
+    assert errors == [[1, 2, 3]]
+
+
+class ArrayConsumer(Consumer):
+    def __init__(self):
+        self.batches = []
+
+    async def consume(self, elements):
+        # elements may be a view into the ring, so copy it before it gets overwritten
+        self.batches.append(elements.copy())
+
+
+@pytest.mark.asyncio
+async def test_disruptor_dtype_consumers_receive_arrays():
+    np = pytest.importorskip('numpy')
+    disruptor = Disruptor(size=4, dtype=np.int64)
+    consumer = ArrayConsumer()
+    disruptor.register_consumer(consumer)
+
+    await disruptor.produce(list(range(6)))
+    await disruptor.close()
+
+    assert all(isinstance(batch, np.ndarray) for batch in consumer.batches)
+    assert np.concatenate(consumer.batches).tolist() == list(range(6))
+
+
+def test_disruptor_failed_registration_leaves_no_seqnum_slot():
+    disruptor = Disruptor(size=4)
+    with pytest.raises(RuntimeError):
+        disruptor.register_consumer(TestConsumer())  # no running event loop
+    assert len(disruptor.consumer_seqnums) == 0
+    assert disruptor.consumers == []
+
+    async def produce_and_close():
+        consumer = TestConsumer()
+        disruptor.register_consumer(consumer)
+        await asyncio.wait_for(disruptor.produce(list(range(10))), 5)
+        await disruptor.close()
+        return consumer.consumed_elements
+
+    assert asyncio.run(produce_and_close()) == list(range(10))
+
+
+class KeepingConsumer(Consumer):
+    def __init__(self):
+        self.batches = []
+
+    async def consume(self, elements):
+        self.batches.append(elements)
+
+
+@pytest.mark.asyncio
+async def test_disruptor_dtype_batches_alias_the_ring():
+    np = pytest.importorskip('numpy')
+    disruptor = Disruptor(size=4, dtype=np.int64)
+    consumer = KeepingConsumer()
+    disruptor.register_consumer(consumer)
+
+    await disruptor.produce([0, 1, 2, 3])
+    await asyncio.sleep(0)
+    await disruptor.produce([4, 5, 6, 7])
+    await disruptor.close()
+
+    # documented behaviour: batches kept without copying are overwritten by later production
+    assert [batch.tolist() for batch in consumer.batches] == [[4, 5, 6, 7], [4, 5, 6, 7]]
+
+
+@pytest.mark.asyncio
+async def test_disruptor_samples_ring_lag_every_256_calls():
+    disruptor = Disruptor(size=4)
+    for _ in range(256):
+        disruptor._unsafe_report_lag()
+    assert disruptor.stats.ring_lag_stats.n_samples == 0  # no consumers, nothing to sample
+
+    disruptor = Disruptor(size=4)
+    disruptor.register_consumer(TestConsumer())
+    for _ in range(255):
+        disruptor._unsafe_report_lag()
+    assert disruptor.stats.ring_lag_stats.n_samples == 0
+
+    disruptor._unsafe_report_lag()
+    assert disruptor.stats.ring_lag_stats.n_samples == 1
 
+    for _ in range(256):
+        disruptor._unsafe_report_lag()
+    assert disruptor.stats.ring_lag_stats.n_samples == 2
     await disruptor.close()